@@ -17,22 +17,31 @@ All portals:
     einforma        - Playwright, registry data (CIF, CNAE, legal form)
     empresia        - Playwright, BORME data (CIF, CNAE, employees, directors)
     librebor        - Playwright, BORME API (CIF, CNAE, incorporation)
+    all             - every portal above in one run, sharing one Playwright driver
 
 Requirements:
-    pip install curl-cffi beautifulsoup4 lxml playwright
+    pip install curl-cffi lxml[cssselect] orjson playwright
     playwright install chromium
+    pip install uvloop  # optional, faster event loop (not on Windows)
 """
 import argparse
 import asyncio
-import json
+import http.cookiejar
+import itertools
 import logging
+import os
 import random
 import re
 import sys
 import time
+from collections import defaultdict, deque
 from pathlib import Path
 from urllib.parse import urljoin, urlparse
 
+import orjson
+from lxml import etree, html as lxml_html
+from lxml.cssselect import CSSSelector
+
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s %(levelname)s %(message)s",
@@ -42,6 +51,41 @@ logger = logging.getLogger(__name__)
 PROFILE_BASE = Path.home() / ".leadgen"
 MIN_DELAY = 4.0  # Minimum seconds between requests
 MAX_DELAY = 7.0  # Maximum seconds between requests
+OUTPUT_BUFFER_SIZE = 1 << 20
+OUTPUT_FLUSH_INTERVAL = 5.0  # Seconds a record may sit in the output buffer
+
+CHALLENGE_INDICATORS = (
+    "challenge-platform", "just a moment", "cf-challenge", "cf_chl_opt",
+    "incapsula", "_incapsula_resource", "incident_id",
+    "human verification", "awswaf",
+    "g-recaptcha-response", 'class="g-recaptcha"', "captcha-delivery",
+    "hcaptcha-box", "capado_robots", "control robots",
+)
+
+# Subresources the extractors never read; aborting them saves bandwidth and paint work
+BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font", "stylesheet", "websocket", "other"})
+BLOCKED_URL_PARTS = ("doubleclick", "googletagmanager", "google-analytics", "facebook", "hotjar")
+# Challenge widgets must render fully so they can be solved by hand
+CHALLENGE_URL_PARTS = ("captcha", "challenge", "incapsula", "awswaf", "cloudflare")
+
+# Browser context settings, whether the profile is launched here or attached over CDP
+CONTEXT_OPTIONS = {
+    "locale": "es-ES",
+    "timezone_id": "Europe/Madrid",
+    "viewport": {"width": 1366, "height": 768},
+}
+
+# In-page counterpart of has_challenge(), evaluated by the browser while we wait
+_CHALLENGE_GONE_JS = """(indicators) => {
+    const html = document.documentElement.outerHTML.toLowerCase();
+    return !indicators.some((i) => html.includes(i));
+}"""
+
+_NON_PHONE_RE = re.compile(r"[^\d+]")
+
+# Comments, PIs and the id() hash table are never used by the extractors;
+# skipping them trims per-node work on large listing pages
+_HTML_PARSER = lxml_html.HTMLParser(remove_comments=True, remove_pis=True, collect_ids=False)
 
 
 # ---------------------------------------------------------------------------
@@ -52,19 +96,76 @@ async def human_delay(min_s: float = MIN_DELAY, max_s: float = MAX_DELAY):
     await asyncio.sleep(random.uniform(min_s, max_s))
 
 
+class HostLimiter:
+    """Per-host request pacing shared by concurrent tasks.
+
+    Each acquire() books the next start slot for the host. Slots are spaced by a
+    random MIN_DELAY-MAX_DELAY gap however many tasks share the limiter, so the
+    host sees the human pace; concurrency only overlaps latency and parsing.
+    The first slot starts at once, so every request to the host, homepage
+    included, has to book one for the next to keep its distance.
+    """
+
+    def __init__(self):
+        self._next = defaultdict(float)
+
+    async def acquire(self, host: str):
+        now = asyncio.get_running_loop().time()
+        start = max(now, self._next[host])
+        self._next[host] = start + random.uniform(MIN_DELAY, MAX_DELAY)
+        if start > now:
+            await asyncio.sleep(start - now)
+
+
+class RateController:
+    """Delay for endpoints that don't need the human pace, like JSON APIs.
+
+    The delay starts at zero and only grows when the server pushes back: each
+    throttle signal doubles it up to ``max_delay``, each success halves it.
+    """
+
+    def __init__(self, initial: float = 1.0, max_delay: float = 60.0):
+        self.initial = initial
+        self.max_delay = max_delay
+        self.delay = 0.0
+
+    def on_success(self):
+        self.delay = self.delay / 2 if self.delay > self.initial else 0.0
+
+    def on_throttle(self):
+        self.delay = min(max(self.delay * 2, self.initial), self.max_delay)
+
+    async def wait(self):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+
+
+def parse_html(text: str):
+    return lxml_html.document_fromstring(text, parser=_HTML_PARSER)
+
+
 def has_challenge(content: str) -> bool:
     lower = content.lower()
-    indicators = [
-        "challenge-platform", "just a moment", "cf-challenge", "cf_chl_opt",
-        "incapsula", "_incapsula_resource", "incident_id",
-        "human verification", "awswaf",
-        "g-recaptcha-response", 'class="g-recaptcha"', "captcha-delivery",
-        "hcaptcha-box", "capado_robots", "control robots",
-    ]
-    return any(i in lower for i in indicators)
+    return any(i in lower for i in CHALLENGE_INDICATORS)
+
+
+def company_key(company):
+    # One record per company across the run, keyed by CIF, else URL, else name
+    return company.get("cif") or company.get("source_url") or company["legal_name"]
+
+
+def is_new_company(company, seen_companies) -> bool:
+    key = company_key(company)
+    if key in seen_companies:
+        return False
+    seen_companies.add(key)
+    return True
 
 
 async def wait_for_challenge(page, timeout: int = 300) -> bool:
+    from playwright.async_api import Error as PlaywrightError
+    from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
     content = await page.content()
     if not has_challenge(content):
         return True
@@ -73,49 +174,228 @@ async def wait_for_challenge(page, timeout: int = 300) -> bool:
         f"Bot challenge detected! Please solve it in the browser window. "
         f"Waiting up to {timeout}s..."
     )
-    elapsed = 0
-    while elapsed < timeout:
-        await asyncio.sleep(5)
-        elapsed += 5
-        content = await page.content()
-        if not has_challenge(content):
+    # The check runs inside the page, so waiting costs no DOM dumps over CDP;
+    # we only wake up to log progress every 30s
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while (remaining := deadline - loop.time()) > 0:
+        try:
+            await page.wait_for_function(
+                _CHALLENGE_GONE_JS, arg=list(CHALLENGE_INDICATORS),
+                polling=500, timeout=min(30, remaining) * 1000,
+            )
             logger.info("Challenge resolved! Resuming.")
             return True
-        if elapsed % 30 == 0:
-            logger.info(f"  Still waiting... ({elapsed}s)")
+        except PlaywrightTimeoutError:
+            if deadline - loop.time() > 0:
+                logger.info(f"  Still waiting... ({round(timeout - (deadline - loop.time()))}s)")
+        except PlaywrightError:
+            # A solved challenge usually navigates, destroying the context being polled
+            await asyncio.sleep(1)
     logger.error(f"Challenge not resolved within {timeout}s.")
     return False
 
 
-async def launch_browser(portal: str, headless: bool = False):
-    from playwright.async_api import async_playwright
+async def launch_browser(pw, portal: str, headless: bool = False):
+    # Returns the context, plus the CDP connection when attached to a running Chrome
+    endpoint = os.environ.get("CDP_ENDPOINT")
+    if endpoint:
+        # A Chrome left running with --remote-debugging-port: no cold start, and
+        # its default context keeps clearance cookies across runs
+        browser = await pw.chromium.connect_over_cdp(endpoint)
+        if browser.contexts:
+            return browser.contexts[0], browser
+        return await browser.new_context(**CONTEXT_OPTIONS), browser
 
     profile_dir = PROFILE_BASE / f"chrome-profile-{portal}"
     profile_dir.mkdir(parents=True, exist_ok=True)
 
-    pw = await async_playwright().start()
-    context = await pw.chromium.launch_persistent_context(
+    return await pw.chromium.launch_persistent_context(
         user_data_dir=str(profile_dir),
         headless=headless,
         channel="chromium",
-        locale="es-ES",
-        timezone_id="Europe/Madrid",
-        viewport={"width": 1366, "height": 768},
         args=[
             "--disable-blink-features=AutomationControlled",
             "--disable-features=IsolateOrigins,site-per-process",
         ],
-    )
-    page = context.pages[0] if context.pages else await context.new_page()
-    return pw, context, page
+        **CONTEXT_OPTIONS,
+    ), None
+
+
+class BrowserPool:
+    """One Playwright driver shared by every portal scraped in a run.
+
+    The driver is started once and persistent contexts are launched lazily per
+    portal profile, so ``--portal all`` pays the cold start once, not per portal.
+    Extra tabs are handed out with ``acquire_page`` and kept open for reuse
+    once released, until the portal's context is closed. When attached to a
+    running Chrome over CDP, the user's own tabs are left alone: the scrapers
+    only drive tabs opened here, resource blocking is routed on those tabs
+    rather than the shared context, and they are closed again on disconnect.
+    """
+
+    def __init__(self, headless: bool = False):
+        self.headless = headless
+        self._pw_task = None
+        self._contexts = {}
+        self._idle_pages = defaultdict(list)
+        # Connections of the contexts attached over CDP, and the tabs opened in them
+        self._cdp = {}
+        self._opened_pages = defaultdict(list)
+        # Resource-blocking route handlers, per portal
+        self._routes = {}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close_all()
+
+    async def start(self):
+        # Kept as a task so a pre-warm and the first get() share one start-up
+        if self._pw_task is None:
+            from playwright.async_api import async_playwright
+            self._pw_task = asyncio.ensure_future(async_playwright().start())
+        return await self._pw_task
+
+    async def get(self, portal: str):
+        if portal not in self._contexts:
+            pw = await self.start()
+            context, browser = await launch_browser(pw, portal, self.headless)
+            if browser is not None:
+                self._cdp[portal] = browser
+            self._contexts[portal] = context
+        return self._contexts[portal]
+
+    async def _new_page(self, portal: str):
+        context = await self.get(portal)
+        page = await context.new_page()
+        if portal in self._cdp:
+            self._opened_pages[portal].append(page)
+            if portal in self._routes:
+                await page.route("**/*", self._routes[portal])
+        return page
+
+    async def block_resources(self, portal: str, keep=()):
+        context = await self.get(portal)
+        handle = self._routes[portal] = resource_blocker(keep)
+        if portal in self._cdp:
+            # The attached context also holds the user's tabs: block on ours only
+            for page in self._opened_pages[portal]:
+                await page.route("**/*", handle)
+        else:
+            await context.route("**/*", handle)
+
+    async def first_page(self, portal: str):
+        # A persistent profile opens with a blank tab to reuse; an attached
+        # Chrome's tabs belong to the user, so a fresh one is opened instead
+        context = await self.get(portal)
+        if portal not in self._cdp and context.pages:
+            return context.pages[0]
+        return await self._new_page(portal)
+
+    async def acquire_page(self, portal: str):
+        idle = self._idle_pages[portal]
+        if idle:
+            return idle.pop()
+        return await self._new_page(portal)
+
+    def release_page(self, portal: str, page):
+        if portal in self._contexts and not page.is_closed():
+            self._idle_pages[portal].append(page)
+
+    async def close(self, portal: str):
+        self._idle_pages.pop(portal, None)
+        opened = self._opened_pages.pop(portal, [])
+        handle = self._routes.pop(portal, None)
+        browser = self._cdp.pop(portal, None)
+        context = self._contexts.pop(portal, None)
+        if context is None:
+            return
+        if browser is not None:
+            # Attached over CDP: close our tabs, then disconnect and leave the
+            # shared browser running
+            for page in opened:
+                if not page.is_closed():
+                    if handle is not None:
+                        await page.unroute("**/*", handle)
+                    await page.close()
+            await browser.close()
+        else:
+            await context.close()
+
+    async def close_all(self):
+        for portal in list(self._contexts):
+            await self.close(portal)
+        if self._pw_task is not None:
+            pw = await self._pw_task
+            self._pw_task = None
+            await pw.stop()
+
+
+async def goto_html(page, url, challenge_timeout=300, timeout=30000):
+    """Return the HTML of server-rendered ``url``, or None if a bot challenge isn't solved.
+
+    The response body is returned as soon as it arrives; the browser only has to
+    finish loading when the server answered with a challenge page instead.
+    """
+    resp = await page.goto(url, wait_until="commit", timeout=timeout)
+    html = await resp.text() if resp else ""
+    if not html or has_challenge(html):
+        await page.wait_for_load_state("domcontentloaded", timeout=timeout)
+        if not await wait_for_challenge(page, timeout=challenge_timeout):
+            return None
+        html = await page.content()
+    return html
+
+
+def resource_blocker(keep=()):
+    # Route handler for "**/*"; installed by BrowserPool.block_resources
+    blocked = BLOCKED_RESOURCE_TYPES.difference(keep)
+
+    async def handle(route):
+        request = route.request
+        url = request.url.lower()
+        # JSON API calls and challenge widgets always go through
+        if "/api/" in url or any(p in url for p in CHALLENGE_URL_PARTS):
+            await route.continue_()
+        elif request.resource_type in blocked or any(p in url for p in BLOCKED_URL_PARTS):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    return handle
 
 
 # ---------------------------------------------------------------------------
 # Empresite (curl_cffi)
 # ---------------------------------------------------------------------------
 
-def _cffi_fetch(url, method="GET", max_retries=3, **kwargs):
-    from curl_cffi import requests as curl_requests
+EMPRESITE_BASE = "https://empresite.eleconomista.es"
+EMPRESITE_CONCURRENCY = 4  # Requests in flight at once on the shared session
+EMPRESITE_MAX_PAGES = 40
+CITY_CACHE_TTL = 7 * 86400  # Province city lists change over months, not days
+EMPRESITE_COOKIES = PROFILE_BASE / "empresite-cookies.json"
+
+_EMPRESITE_CITY_RE = re.compile(r"/localidad/([^/]+)/")
+_EMPRESITE_CNAE_RE = re.compile(r"'CNAE'\s*:\s*'(\d+)'.*?'GRUPO_SECTOR'\s*:\s*'([^']*)'")
+# Phone, email and website candidates of a detail page, in one document-order pass
+_EMPRESITE_DETAIL_XP = etree.XPath(
+    "//span[@itemprop='telephone'] | //a[starts-with(@href, 'tel:')]"
+    " | //a[starts-with(@href, 'mailto:')] | //a[@itemprop='url'][contains(@href, 'http')]"
+)
+# Listing selectors, compiled once instead of on every card
+_EMPRESITE_CARDS = CSSSelector("div.cardCompanyBox")
+_EMPRESITE_CITY_LINKS = CSSSelector("a[href*='/localidad/']")
+_EMPRESITE_NAME_XP = etree.XPath("(.//meta[@itemprop='name'])[1]/@content")
+_EMPRESITE_DETAIL_HREF_XP = etree.XPath("(.//h3//a)[1]/@href")
+_EMPRESITE_DESC_XP = etree.XPath(
+    "string((.//span[contains(concat(' ', normalize-space(@class), ' '), ' line-clamp-2 ')])[1])"
+)
+_EMPRESITE_ADDRESS_XP = etree.XPath("string((.//span[@itemprop='address'])[1])")
+
+
+async def _cffi_fetch(session, url, method="GET", max_retries=3, **kwargs):
     headers = {
         "Accept-Language": "es-ES,es;q=0.9,en;q=0.8",
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
@@ -123,143 +403,290 @@ def _cffi_fetch(url, method="GET", max_retries=3, **kwargs):
         **kwargs.pop("headers", {}),
     }
     for attempt in range(max_retries):
-        resp = curl_requests.request(method, url, impersonate="chrome", headers=headers, **kwargs)
+        resp = await session.request(method, url, headers=headers, **kwargs)
         if resp.status_code == 429 and attempt < max_retries - 1:
             wait = 30 * (2 ** attempt)
             logger.warning(f"Rate limited, waiting {wait}s...")
-            time.sleep(wait)
+            await asyncio.sleep(wait)
             continue
         return resp
     return resp
 
 
-async def scrape_empresite(region, city, limit, **kwargs):
-    from bs4 import BeautifulSoup
+async def _paced_fetch(session, sem, limiter, url, wanted=None, **kwargs):
+    # Pace inside the semaphore so a booked slot is never spent waiting for one.
+    # ``wanted`` is asked again after each wait; None is returned once it says no
+    async with sem:
+        if wanted is not None and not wanted():
+            return None
+        await limiter.acquire(urlparse(url).netloc)
+        if wanted is not None and not wanted():
+            return None
+        return await _cffi_fetch(session, url, **kwargs)
 
-    BASE = "https://empresite.eleconomista.es"
-    total = 0
-    companies = []
-
-    if city:
-        cities = [(city, city)]
-    else:
-        # Get city list
-        resp = _cffi_fetch(f"{BASE}/provincia/{region}/")
-        if resp.status_code != 200:
-            logger.error(f"Failed to get cities: {resp.status_code}")
-            return companies
-        soup = BeautifulSoup(resp.text, "lxml")
-        cities = []
-        for link in soup.select("a[href*='/localidad/']"):
-            m = re.search(r"/localidad/([^/]+)/", link["href"])
-            if m:
-                cities.append((link.get_text(strip=True).split("(")[0].strip(), m.group(1)))
 
-    emp_range = f"{kwargs.get('employee_min', 10)}-{kwargs.get('employee_max', 200)}"
-
-    for city_name, city_slug in cities:
-        if limit and total >= limit:
-            break
-
-        page = 1
-        while True:
-            if limit and total >= limit:
+async def _fetch_empresite_detail(session, sem, limiter, company):
+    try:
+        dresp = await _paced_fetch(session, sem, limiter, company["source_url"])
+        if dresp.status_code != 200:
+            return
+        m = _EMPRESITE_CNAE_RE.search(dresp.text)
+        if m:
+            company["cnae_code"] = m.group(1)
+            company["industry"] = m.group(2)
+        # Keep the first candidate of each kind, as the per-field selects did
+        ph = em = web = None
+        for el in _EMPRESITE_DETAIL_XP(parse_html(dresp.text)):
+            href = el.get("href", "")
+            if el.tag == "span" or href.startswith("tel:"):
+                if ph is None:
+                    ph = el
+            elif href.startswith("mailto:"):
+                em = em or href
+            else:
+                web = web or href
+            if ph is not None and em and web:
                 break
+        if ph is not None:
+            phone = _NON_PHONE_RE.sub("", ph.get("content") or ph.text_content().strip())
+            if len(phone) >= 9:
+                company["phone"] = phone
+        if em:
+            company["email"] = em.replace("mailto:", "")
+        if web and "empresite" not in web:
+            company["website_url"] = web
+            company["domain"] = urlparse(web).netloc.replace("www.", "")
+    except Exception:
+        pass
+
+
+async def _fetch_empresite_listing(session, sem, limiter, city_slug, page, wanted=None, **kwargs):
+    # The page's company cards; empty if the page is missing, no longer wanted or
+    # the request failed
+    BASE = EMPRESITE_BASE
+    emp_range = f"{kwargs.get('employee_min', 10)}-{kwargs.get('employee_max', 200)}"
 
-            base_path = f"/localidad/{city_slug}/"
-            if page > 1:
-                base_path += f"PgNum-{page}/"
-            url = f"{BASE}{base_path}?testfiltros=1&emp_empleados_number={emp_range}"
+    base_path = f"/localidad/{city_slug}/"
+    if page > 1:
+        base_path += f"PgNum-{page}/"
+    url = f"{BASE}{base_path}?testfiltros=1&emp_empleados_number={emp_range}"
 
-            await asyncio.sleep(random.uniform(MIN_DELAY, MAX_DELAY))
-            logger.info(f"Empresite: {city_slug} page {page}")
+    logger.info(f"Empresite: {city_slug} page {page}")
+    try:
+        resp = await _paced_fetch(session, sem, limiter, url, wanted, method="POST", headers={
+            "Content-Type": "application/x-www-form-urlencoded;charset=UTF-8",
+            "Referer": f"{BASE}/localidad/{city_slug}/",
+        })
+        if resp is None or resp.status_code != 200:
+            return []
+    except Exception as e:
+        logger.error(f"Request failed: {e}")
+        return []
+
+    return _EMPRESITE_CARDS(parse_html(resp.text))
+
+
+def _claim_empresite_cards(cards, region, city_slug, limit, claims, seen_companies):
+    # New companies of a listing page, each claiming a slot of the limit (shared
+    # by all cities) before its details are fetched; True once the limit is used up
+    BASE = EMPRESITE_BASE
+    # Fields shared by every card of the page, normalised once. Interned, so
+    # every page of a city (and every city) shares one string per name
+    region_title = sys.intern(region.title())
+    template = {
+        "city": sys.intern(city_slug.split("-")[0].replace("-", " ").title()),
+        "province": region_title,
+        "region": region_title,
+    }
+    companies = []
+    for card in cards:
+        # XPath attribute/text queries return plain strings, no element wrapping
+        legal_name = "".join(_EMPRESITE_NAME_XP(card)).strip()
+        if not legal_name:
+            continue
 
+        detail_url = "".join(_EMPRESITE_DETAIL_HREF_XP(card))
+        if detail_url and not detail_url.startswith("http"):
+            detail_url = urljoin(BASE, detail_url)
+
+        desc = _EMPRESITE_DESC_XP(card)
+        addr = _EMPRESITE_ADDRESS_XP(card)
+
+        company = {
+            "legal_name": legal_name.upper(),
+            **template,
+            "address": addr.strip(),
+            "summary": desc.strip()[:500],
+            "source_portal": "empresite",
+            "source_url": detail_url,
+        }
+        # Duplicates are dropped before they can use up a slot of the limit
+        key = company_key(company)
+        if key in seen_companies:
+            continue
+        if limit and next(claims) > limit:
+            return companies, True
+        seen_companies.add(key)
+        companies.append(company)
+    return companies, False
+
+
+async def _crawl_empresite_pages(session, sem, limiter, region, cities, limit, claims, results, seen_companies,
+                                 **kwargs):
+    # Every (city, page) listing is queued up front, page-major, so page N+1 of a
+    # city is only picked up once the page-N round is under way. Listings are
+    # fetched concurrently, but each city's pages claim their companies in page
+    # order: once a page comes back short, the later ones (queued or already in
+    # flight) are dropped before they claim slots or fetch details.
+    jobs = deque((city_slug, page) for page in range(1, EMPRESITE_MAX_PAGES + 1) for _, city_slug in cities)
+    last_page = {}
+    settled = defaultdict(asyncio.Event)
+
+    def wanted(city_slug, page):
+        return page <= last_page.get(city_slug, EMPRESITE_MAX_PAGES)
+
+    async def worker():
+        while jobs:
+            city_slug, page = jobs.popleft()
+            companies = []
             try:
-                resp = _cffi_fetch(url, method="POST", headers={
-                    "Content-Type": "application/x-www-form-urlencoded;charset=UTF-8",
-                    "Referer": f"{BASE}/localidad/{city_slug}/",
-                })
-                if resp.status_code != 200:
-                    break
-            except Exception as e:
-                logger.error(f"Request failed: {e}")
-                break
-
-            soup = BeautifulSoup(resp.text, "lxml")
-            cards = soup.select("div.cardCompanyBox")
-            if not cards:
-                break
-
-            for card in cards:
-                if limit and total >= limit:
-                    break
-
-                name_meta = card.select_one('meta[itemprop="name"]')
-                if not name_meta:
+                if not wanted(city_slug, page):
                     continue
-                legal_name = name_meta.get("content", "").strip()
-                if not legal_name:
+                # Asked again once the request's turn comes, as a short page may
+                # have come back in the meantime
+                cards = await _fetch_empresite_listing(
+                    session, sem, limiter, city_slug, page, lambda: wanted(city_slug, page), **kwargs
+                )
+                if page > 1:
+                    await settled[city_slug, page - 1].wait()
+                if not wanted(city_slug, page):
                     continue
+                if len(cards) < 30:
+                    last_page[city_slug] = page if cards else page - 1
+                companies, quota_reached = _claim_empresite_cards(cards, region, city_slug, limit, claims, seen_companies)
+                if quota_reached:
+                    jobs.clear()
+            finally:
+                settled[city_slug, page].set()
+
+            # Scrape detail pages for website URL (+ CNAE/phone/email)
+            # Website URLs let us scrape emails directly instead of paying APIs
+            # Default: ON. Use --no-details to skip (faster but no website)
+            # The page's detail fetches are independent, so they overlap on the semaphore
+            if kwargs.get("details", True):
+                await asyncio.gather(*[
+                    _fetch_empresite_detail(session, sem, limiter, company)
+                    for company in companies if company["source_url"]
+                ])
+            for company in companies:
+                await results.put(company)
+
+    await asyncio.gather(*[worker() for _ in range(EMPRESITE_CONCURRENCY)])
+
+
+async def _load_cities(session, limiter, region):
+    # The province index is the most visible endpoint: serve it from disk when fresh
+    cache_file = PROFILE_BASE / "cache" / f"{region}-cities.json"
+    try:
+        if time.time() - cache_file.stat().st_mtime < CITY_CACHE_TTL:
+            return [tuple(c) for c in orjson.loads(cache_file.read_bytes())]
+    except (OSError, orjson.JSONDecodeError):
+        pass
+
+    # Get city list; it books a slot too, so the first listing keeps its distance
+    url = f"{EMPRESITE_BASE}/provincia/{region}/"
+    await limiter.acquire(urlparse(url).netloc)
+    resp = await _cffi_fetch(session, url)
+    if resp.status_code != 200:
+        logger.error(f"Failed to get cities: {resp.status_code}")
+        return None
+    doc = parse_html(resp.text)
+    cities = []
+    for link in _EMPRESITE_CITY_LINKS(doc):
+        m = _EMPRESITE_CITY_RE.search(link.get("href"))
+        if m:
+            cities.append((link.text_content().strip().split("(")[0].strip(), m.group(1)))
+
+    if cities:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        cache_file.write_bytes(orjson.dumps(cities))
+    return cities
+
+
+def _load_cookies(session):
+    # Carries clearance/session cookies over from the previous run
+    try:
+        saved = orjson.loads(EMPRESITE_COOKIES.read_bytes())
+    except (OSError, orjson.JSONDecodeError):
+        return
+    now = time.time()
+    for c in saved:
+        if c["expires"] is not None and c["expires"] <= now:
+            continue
+        # Built by hand: Cookies.set() would drop the expiry and the Secure flag
+        domain = c["domain"]
+        session.cookies.jar.set_cookie(http.cookiejar.Cookie(
+            version=0, name=c["name"], value=c["value"], port=None, port_specified=False,
+            domain=domain, domain_specified=domain.startswith("."),
+            domain_initial_dot=domain.startswith("."), path=c["path"], path_specified=True,
+            secure=c.get("secure", False), expires=c["expires"], discard=c["expires"] is None,
+            comment=None, comment_url=None, rest={},
+        ))
+
+
+def _save_cookies(session):
+    cookies = [
+        {"name": c.name, "value": c.value, "domain": c.domain, "path": c.path,
+         "expires": c.expires, "secure": c.secure}
+        for c in session.cookies.jar
+    ]
+    EMPRESITE_COOKIES.parent.mkdir(parents=True, exist_ok=True)
+    EMPRESITE_COOKIES.write_bytes(orjson.dumps(cookies))
 
-                link_el = card.select_one("h3 a")
-                detail_url = ""
-                if link_el:
-                    detail_url = link_el["href"]
-                    if not detail_url.startswith("http"):
-                        detail_url = urljoin(BASE, detail_url)
-
-                desc_el = card.select_one("span.line-clamp-2")
-                addr_el = card.select_one('span[itemprop="address"]')
-
-                company = {
-                    "legal_name": legal_name.upper(),
-                    "city": city_slug.split("-")[0].replace("-", " ").title(),
-                    "province": region.title(),
-                    "region": region.title(),
-                    "address": addr_el.get_text(strip=True) if addr_el else "",
-                    "summary": desc_el.get_text(strip=True)[:500] if desc_el else "",
-                    "source_portal": "empresite",
-                    "source_url": detail_url,
-                }
-
-                # Scrape detail page for website URL (+ CNAE/phone/email)
-                # Website URLs let us scrape emails directly instead of paying APIs
-                # Default: ON. Use --no-details to skip (faster but no website)
-                if detail_url and kwargs.get("details", True):
-                    await asyncio.sleep(random.uniform(MIN_DELAY, MAX_DELAY))
-                    try:
-                        dresp = _cffi_fetch(detail_url)
-                        if dresp.status_code == 200:
-                            m = re.search(r"'CNAE'\s*:\s*'(\d+)'.*?'GRUPO_SECTOR'\s*:\s*'([^']*)'", dresp.text)
-                            if m:
-                                company["cnae_code"] = m.group(1)
-                                company["industry"] = m.group(2)
-                            dsoup = BeautifulSoup(dresp.text, "lxml")
-                            ph = dsoup.select_one('span[itemprop="telephone"], a[href^="tel:"]')
-                            if ph:
-                                phone = re.sub(r"[^\d+]", "", ph.get("content") or ph.get_text(strip=True))
-                                if len(phone) >= 9:
-                                    company["phone"] = phone
-                            em = dsoup.select_one('a[href^="mailto:"]')
-                            if em:
-                                company["email"] = em["href"].replace("mailto:", "")
-                            web = dsoup.select_one('a[itemprop="url"][href*="http"]')
-                            if web and "empresite" not in web["href"]:
-                                company["website_url"] = web["href"]
-                                company["domain"] = urlparse(web["href"]).netloc.replace("www.", "")
-                    except Exception:
-                        pass
 
-                companies.append(company)
-                total += 1
+async def scrape_empresite(region, city, limit, seen_companies=None, **kwargs):
+    from curl_cffi.requests import AsyncSession
 
-            if len(cards) < 30:
-                break
-            if page >= 40:
-                break
-            page += 1
+    seen_companies = set() if seen_companies is None else seen_companies
 
-    return companies
+    # One session for the whole run: TCP/TLS connections are reused across requests
+    async with AsyncSession(impersonate="chrome") as session:
+        _load_cookies(session)
+        limiter = HostLimiter()
+        try:
+            if city:
+                cities = [(city, city)]
+            else:
+                cities = await _load_cities(session, limiter, region)
+                if cities is None:
+                    return
+
+            # Listing pages are fetched by a small worker pool; the semaphore caps
+            # how many requests are in flight at once. Companies are handed back
+            # through a queue and yielded as soon as they are complete.
+            sem = asyncio.Semaphore(EMPRESITE_CONCURRENCY)
+            claims = itertools.count(1)
+            results = asyncio.Queue()
+            crawl = asyncio.ensure_future(_crawl_empresite_pages(
+                session, sem, limiter, region, cities, limit, claims, results, seen_companies, **kwargs
+            ))
+            crawl.add_done_callback(lambda _: results.put_nowait(None))
+
+            total = 0
+            try:
+                while (company := await results.get()) is not None:
+                    yield company
+                    total += 1
+                    if limit and total >= limit:
+                        break
+                else:
+                    await crawl  # Surface errors raised inside the city crawlers
+            finally:
+                # Let the cancelled workers unwind before the session closes
+                crawl.cancel()
+                await asyncio.gather(crawl, return_exceptions=True)
+        finally:
+            _save_cookies(session)
 
 
 # ---------------------------------------------------------------------------
@@ -272,24 +699,125 @@ EUROPAGES_SEARCH_TERMS = [
     "quimico", "metalurgia", "farmaceutico", "ingenieria", "maquinaria",
 ]
 
-async def scrape_europages(region, city, limit, headless=False, **kwargs):
-    pw, context, page = await launch_browser("europages", headless)
-    companies = []
+EUROPAGES_CONCURRENCY = 3  # Company pages visited at once on the shared context
+
+_EUROPAGES_COMPANY_HREF_RE = re.compile(r'href="(/es/company/[^"]+)"')
+_EUROPAGES_PRODUCTS_RE = re.compile(r"/products/.*")
+_EUROPAGES_EMPLOYEES_RE = re.compile(r"Empleados:\s*([\d\s\-–]+)")
+_EUROPAGES_FOUNDED_RE = re.compile(r"Fundada:\s*(\d{4})")
+_EUROPAGES_ADDRESS_RE = re.compile(r"([\w\s/.,-]+\d{4,5})\s*\n?\s*España")
+_EUROPAGES_NEXT = CSSSelector("a[rel='next'], [aria-label='Next']")
+
+EUROPAGES_EXTRACT_JS = """() => {
+    const text = (e) => (e ? e.innerText.trim() : null);
+    const web = [...document.querySelectorAll("a[href*='http']")]
+        .find((a) => a.textContent.includes("Visitar"));
+    const phone = document.querySelector("a[href^='tel:']");
+    return {
+        headings: ["h1", "h2"].map((s) => text(document.querySelector(s)) || ""),
+        web: web ? web.getAttribute("href") : null,
+        phone: phone ? phone.getAttribute("href") : null,
+        desc: text(document.querySelector("div[class*='description'], div[class*='about'] p")),
+        bodyText: document.body.innerText,
+    };
+}"""
+
+
+async def _scrape_europages_company(page, limiter, base, slug, template):
+    await limiter.acquire(urlparse(base).netloc)
+    try:
+        await page.goto(f"{base}{slug}", wait_until="domcontentloaded", timeout=30000)
+    except Exception:
+        return None
+    if not await wait_for_challenge(page, timeout=120):
+        return None
+
+    await human_delay(1, 3)
+    # Every field in one round trip, queried by the browser itself
+    try:
+        data = await page.evaluate(EUROPAGES_EXTRACT_JS)
+    except Exception:
+        return None
+    text = data["bodyText"]
+
+    name = None
+    for raw in data["headings"]:
+        raw = raw.strip()
+        if raw.upper().startswith("SOBRE "):
+            raw = raw[6:].strip()
+        if raw:
+            name = raw
+            break
+    if not name:
+        return None
+
+    company = {
+        "legal_name": name.upper(),
+        "source_url": f"{base}{slug}",
+        **template,
+    }
+
+    emp = _EUROPAGES_EMPLOYEES_RE.search(text)
+    if emp:
+        company["employee_count"] = emp.group(1).strip()
+
+    href = data["web"]
+    if href and "europages" not in href:
+        company["website_url"] = href
+        company["domain"] = urlparse(href).netloc.replace("www.", "")
+
+    founded = _EUROPAGES_FOUNDED_RE.search(text)
+    addr = _EUROPAGES_ADDRESS_RE.search(text)
+    if addr:
+        company["address"] = addr.group(1).strip()
+
+    if data["desc"]:
+        company["summary"] = data["desc"][:500]
+
+    if data["phone"]:
+        ph = _NON_PHONE_RE.sub("", data["phone"].replace("tel:", ""))
+        if len(ph) >= 9:
+            company["phone"] = ph
+
+    return company
+
+
+async def scrape_europages(region, city, limit, pool, seen_companies=None, **kwargs):
+    seen_companies = set() if seen_companies is None else seen_companies
+    await pool.block_resources("europages")
+    page = await pool.first_page("europages")
+    total = 0
     seen_urls = set()
-    location = city.title() if city else region.title()
+    region_title = sys.intern(region.title())
+    template = {"source_portal": "europages", "region": region_title, "province": region_title, "city": region_title}
+    location = city.title() if city else region_title
     BASE = "https://www.europages.es"
+    host = urlparse(BASE).netloc
+    # Listing and company tabs share one per-host schedule
+    limiter = HostLimiter()
+
+    # Company pages are visited on pooled tabs, a few at a time
+    sem = asyncio.Semaphore(EUROPAGES_CONCURRENCY)
+
+    async def visit(slug):
+        async with sem:
+            detail_page = await pool.acquire_page("europages")
+            try:
+                return await _scrape_europages_company(detail_page, limiter, BASE, slug, template)
+            finally:
+                pool.release_page("europages", detail_page)
 
     try:
         for term in EUROPAGES_SEARCH_TERMS:
-            if limit and len(companies) >= limit:
+            if limit and total >= limit:
                 break
 
             page_num = 1
             while True:
-                if limit and len(companies) >= limit:
+                if limit and total >= limit:
                     break
 
-                await human_delay()
+                await limiter.acquire(host)
                 url = f"{BASE}/es/search?q={term}&location={location}"
                 if page_num > 1:
                     url += f"&page={page_num}"
@@ -306,10 +834,12 @@ async def scrape_europages(region, city, limit, headless=False, **kwargs):
 
                 await human_delay(2, 4)
                 content = await page.content()
-                raw_links = re.findall(r'href="(/es/company/[^"]+)"', content)
+                listing = parse_html(content)
+                raw_links = _EUROPAGES_COMPANY_HREF_RE.findall(content)
                 slugs = []
-                for link in raw_links:
-                    base = re.sub(r"/products/.*", "", link)
+                # Cards repeat their links; strip /products/ once per distinct href
+                for link in dict.fromkeys(raw_links):
+                    base = _EUROPAGES_PRODUCTS_RE.sub("", link)
                     if base not in seen_urls:
                         seen_urls.add(base)
                         slugs.append(base)
@@ -317,82 +847,21 @@ async def scrape_europages(region, city, limit, headless=False, **kwargs):
                 if not slugs:
                     break
 
-                for slug in slugs:
-                    if limit and len(companies) >= limit:
-                        break
-                    await human_delay()
-                    try:
-                        await page.goto(f"{BASE}{slug}", wait_until="domcontentloaded", timeout=30000)
-                    except Exception:
-                        continue
-                    if not await wait_for_challenge(page, timeout=120):
-                        continue
-
-                    await human_delay(1, 3)
-                    text = await page.inner_text("body")
-
-                    name = None
-                    for sel in ["h1", "h2"]:
-                        el = await page.query_selector(sel)
-                        if el:
-                            raw = (await el.inner_text()).strip()
-                            if raw.upper().startswith("SOBRE "):
-                                raw = raw[6:].strip()
-                            if raw:
-                                name = raw
-                                break
-                    if not name:
-                        continue
-
-                    company = {
-                        "legal_name": name.upper(),
-                        "source_portal": "europages",
-                        "source_url": f"{BASE}{slug}",
-                        "region": region.title(),
-                        "province": region.title(),
-                        "city": region.title(),
-                    }
-
-                    emp = re.search(r"Empleados:\s*([\d\s\-–]+)", text)
-                    if emp:
-                        company["employee_count"] = emp.group(1).strip()
+                if limit:
+                    slugs = slugs[:limit - total]
+                # A failed company page is skipped; it never aborts its siblings
+                for company in await asyncio.gather(*[visit(slug) for slug in slugs], return_exceptions=True):
+                    if company and not isinstance(company, Exception) and is_new_company(company, seen_companies):
+                        yield company
+                        total += 1
+                        logger.debug(f"  Saved: {company['legal_name']}")
 
-                    web_el = await page.query_selector("a[href*='http']:has-text('Visitar')")
-                    if web_el:
-                        href = await web_el.get_attribute("href")
-                        if href and "europages" not in href:
-                            company["website_url"] = href
-                            company["domain"] = urlparse(href).netloc.replace("www.", "")
-
-                    founded = re.search(r"Fundada:\s*(\d{4})", text)
-                    addr = re.search(r"([\w\s/.,-]+\d{4,5})\s*\n?\s*España", text)
-                    if addr:
-                        company["address"] = addr.group(1).strip()
-
-                    desc_el = await page.query_selector("div[class*='description'], div[class*='about'] p")
-                    if desc_el:
-                        desc = (await desc_el.inner_text()).strip()
-                        if desc:
-                            company["summary"] = desc[:500]
-
-                    phone_el = await page.query_selector("a[href^='tel:']")
-                    if phone_el:
-                        ph = re.sub(r"[^\d+]", "", (await phone_el.get_attribute("href")).replace("tel:", ""))
-                        if len(ph) >= 9:
-                            company["phone"] = ph
-
-                    companies.append(company)
-                    logger.debug(f"  Saved: {company['legal_name']}")
-
-                has_next = await page.query_selector("a[rel='next'], [aria-label='Next']")
+                has_next = _EUROPAGES_NEXT(listing)
                 if not has_next or page_num >= 10:
                     break
                 page_num += 1
     finally:
-        await context.close()
-        await pw.stop()
-
-    return companies
+        await pool.close("europages")
 
 
 # ---------------------------------------------------------------------------
@@ -410,96 +879,116 @@ PA_PROVINCES = {
     "SEVILLA": "sevilla", "MALAGA": "malaga", "ALICANTE": "alicante",
     "ZARAGOZA": "zaragoza", "BILBAO": "vizcaya", "MURCIA": "murcia",
 }
-
-async def scrape_paginasamarillas(region, city, limit, headless=False, **kwargs):
-    pw, context, page = await launch_browser("paginasamarillas", headless)
-    companies = []
+# Keyed case-insensitively; looked up with region.casefold()
+PA_PROVINCES = {k.casefold(): v for k, v in PA_PROVINCES.items()}
+
+_PA_LISTINGS = CSSSelector("div.listado-item, div.search-result, article, [data-name]")
+_PA_NAME = CSSSelector("h2 a, h2 span, [itemprop='name']")
+_PA_PHONE = CSSSelector("a[href^='tel:'], [itemprop='telephone']")
+_PA_ADDRESS = CSSSelector("[itemprop='address'], span.address")
+_PA_LOCALITY = CSSSelector("[itemprop='addressLocality']")
+_PA_WEB = CSSSelector("a[data-type='web'], a.web")
+_PA_NEXT = CSSSelector("a.next, a[rel='next']")
+
+async def scrape_paginasamarillas(region, city, limit, pool, seen_companies=None, **kwargs):
+    seen_companies = set() if seen_companies is None else seen_companies
+    await pool.block_resources("paginasamarillas")
+    page = await pool.first_page("paginasamarillas")
+    total = 0
     seen = set()
     BASE = "https://www.paginasamarillas.es"
-    province = PA_PROVINCES.get(region.upper(), region.lower())
+    host = urlparse(BASE).netloc
+    limiter = HostLimiter()
+    province = PA_PROVINCES.get(region.casefold(), region.lower())
+    region_title = sys.intern(region.title())
+    template = {"source_portal": "paginasamarillas", "region": region_title, "province": region_title, "city": region_title}
 
     try:
         logger.info("PaginasAmarillas: navigating to homepage...")
+        await limiter.acquire(host)
         await page.goto(BASE, wait_until="domcontentloaded", timeout=30000)
         await human_delay(3, 5)
         if not await wait_for_challenge(page):
-            return companies
+            return
 
         logger.info("PaginasAmarillas: access granted!")
 
         for cat in PA_CATEGORIES:
-            if limit and len(companies) >= limit:
+            if limit and total >= limit:
                 break
             pnum = 1
             while True:
-                if limit and len(companies) >= limit:
+                if limit and total >= limit:
                     break
-                await human_delay()
+                await limiter.acquire(host)
                 url = f"{BASE}/search/{cat}/all-ma/{province}/all-is/{province}/all-ba/all-pu/all-nc/{pnum}"
                 logger.info(f"PaginasAmarillas: '{cat}' page {pnum}")
+                # Results are server-rendered: no need to wait for scripts to settle
                 try:
-                    await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+                    html = await goto_html(page, url, challenge_timeout=120)
                 except Exception:
                     break
-                if not await wait_for_challenge(page, timeout=120):
+                if html is None:
                     break
-                await human_delay(2, 4)
 
-                listings = await page.query_selector_all(
-                    "div.listado-item, div.search-result, article, [data-name]"
-                )
+                # Parse the HTML once; per-card CDP queries cost a round-trip each
+                doc = parse_html(html)
+                listings = _PA_LISTINGS(doc)
                 if not listings:
                     break
 
                 new = 0
                 for li in listings:
-                    if limit and len(companies) >= limit:
+                    if limit and total >= limit:
                         break
-                    name_el = await li.query_selector("h2 a, h2 span, [itemprop='name']")
+                    name_el = _PA_NAME(li)
                     if not name_el:
                         continue
-                    name = (await name_el.inner_text()).strip()
-                    if not name or name.upper() in seen:
+                    name = name_el[0].text_content().strip()
+                    if not name:
+                        continue
+                    # Uppercased once: it is both the dedup key and the legal name
+                    key = name.upper()
+                    if key in seen:
                         continue
-                    seen.add(name.upper())
+                    seen.add(key)
 
-                    c = {"legal_name": name.upper(), "source_portal": "paginasamarillas",
-                         "region": region.title(), "province": region.title(), "city": region.title()}
+                    c = {"legal_name": key, **template}
 
-                    ph_el = await li.query_selector("a[href^='tel:'], [itemprop='telephone']")
+                    ph_el = _PA_PHONE(li)
                     if ph_el:
-                        ph = re.sub(r"[^\d+]", "", (await ph_el.get_attribute("href") or await ph_el.inner_text()).replace("tel:", ""))
+                        ph = _NON_PHONE_RE.sub("", (ph_el[0].get("href") or ph_el[0].text_content()).replace("tel:", ""))
                         if len(ph) >= 9:
                             c["phone"] = ph
 
-                    addr_el = await li.query_selector("[itemprop='address'], span.address")
+                    addr_el = _PA_ADDRESS(li)
                     if addr_el:
-                        c["address"] = (await addr_el.inner_text()).strip()
-                        city_el = await addr_el.query_selector("[itemprop='addressLocality']")
+                        c["address"] = addr_el[0].text_content().strip()
+                        city_el = _PA_LOCALITY(addr_el[0])
                         if city_el:
-                            c["city"] = (await city_el.inner_text()).strip().title()
+                            c["city"] = city_el[0].text_content().strip().title()
 
-                    web_el = await li.query_selector("a[data-type='web'], a.web")
+                    web_el = _PA_WEB(li)
                     if web_el:
-                        href = await web_el.get_attribute("href")
+                        href = web_el[0].get("href")
                         if href and "paginasamarillas" not in href and href.startswith("http"):
                             c["website_url"] = href
                             c["domain"] = urlparse(href).netloc.replace("www.", "")
 
-                    companies.append(c)
+                    if not is_new_company(c, seen_companies):
+                        continue
+                    yield c
+                    total += 1
                     new += 1
 
                 if new == 0:
                     break
-                has_next = await page.query_selector("a.next, a[rel='next']")
+                has_next = _PA_NEXT(doc)
                 if not has_next or pnum >= 20:
                     break
                 pnum += 1
     finally:
-        await context.close()
-        await pw.stop()
-
-    return companies
+        await pool.close("paginasamarillas")
 
 
 # ---------------------------------------------------------------------------
@@ -511,15 +1000,32 @@ EINFORMA_PROVINCES = {
     "SEVILLA": "sevilla", "MALAGA": "malaga", "ALICANTE": "alicante",
     "ZARAGOZA": "zaragoza", "BILBAO": "vizcaya", "MURCIA": "murcia",
 }
-
-async def scrape_einforma(region, city, limit, headless=False, **kwargs):
-    pw, context, page = await launch_browser("einforma", headless)
-    companies = []
+EINFORMA_PROVINCES = {k.casefold(): v for k, v in EINFORMA_PROVINCES.items()}
+
+_EINFORMA_HREF_RE = re.compile(r'href="(/informes-empresa/[^"]+)"')
+_EINFORMA_SLUG_RE = re.compile(r"/informes-empresa/([^/]+)")
+_CIF_RE = re.compile(r"[A-Z]\d{7,8}")
+_EINFORMA_ROWS = CSSSelector("table tr, .empresa-item, .result-row")
+_EINFORMA_NAME = CSSSelector("a[href*='/informes-empresa/'], td:first-child a")
+_EINFORMA_CIF = CSSSelector(".cif, td:nth-child(2)")
+_EINFORMA_EXTERNAL_XP = etree.XPath(".//a[starts-with(@href, 'http')]/@href")
+_EINFORMA_NEXT_XP = etree.XPath("//a[@rel='next'] | //a[contains(., 'Siguiente')]")
+
+async def scrape_einforma(region, city, limit, pool, seen_companies=None, **kwargs):
+    seen_companies = set() if seen_companies is None else seen_companies
+    await pool.block_resources("einforma")
+    page = await pool.first_page("einforma")
+    total = 0
     BASE = "https://www.einforma.com"
-    province = EINFORMA_PROVINCES.get(region.upper(), region.lower())
+    host = urlparse(BASE).netloc
+    limiter = HostLimiter()
+    province = EINFORMA_PROVINCES.get(region.casefold(), region.lower())
+    region_title = sys.intern(region.title())
+    template = {"source_portal": "einforma", "region": region_title, "province": region_title, "city": region_title}
 
     try:
         logger.info("Einforma: navigating to homepage...")
+        await limiter.acquire(host)
         await page.goto(BASE, wait_until="domcontentloaded", timeout=30000)
         await human_delay(3, 5)
 
@@ -532,95 +1038,89 @@ async def scrape_einforma(region, city, limit, headless=False, **kwargs):
         except Exception:
             pass
 
-        # Load listing page
-        await page.goto(f"{BASE}/informes-empresas/{province}.html", wait_until="domcontentloaded", timeout=30000)
-        await human_delay(3, 5)
-        if not await wait_for_challenge(page):
-            return companies
+        # Load listing page (server-rendered, so the raw response is all we need)
+        await limiter.acquire(host)
+        content = await goto_html(page, f"{BASE}/informes-empresas/{province}.html")
+        if content is None:
+            return
 
         logger.info("Einforma: access granted!")
 
         pnum = 1
         while True:
-            if limit and len(companies) >= limit:
+            if limit and total >= limit:
                 break
 
             if pnum > 1:
-                await human_delay()
+                await limiter.acquire(host)
                 url = f"{BASE}/informes-empresas/{province}-{pnum}.html"
                 logger.info(f"Einforma: page {pnum}")
                 try:
-                    await page.goto(url, wait_until="domcontentloaded", timeout=30000)
+                    content = await goto_html(page, url, challenge_timeout=120)
                 except Exception:
                     break
-                if not await wait_for_challenge(page, timeout=120):
+                if content is None:
                     break
-                await human_delay(2, 4)
 
-            content = await page.content()
-            links = re.findall(r'href="(/informes-empresa/[^"]+)"', content)
-            rows = await page.query_selector_all("table tbody tr, .empresa-item, .result-row")
+            doc = parse_html(content)
+            links = _EINFORMA_HREF_RE.findall(content)
+            # Raw server HTML may omit the <tbody> a browser would insert
+            rows = _EINFORMA_ROWS(doc)
 
             if rows:
                 for row in rows:
-                    if limit and len(companies) >= limit:
+                    if limit and total >= limit:
                         break
-                    name_el = await row.query_selector("a[href*='/informes-empresa/'], td:first-child a")
+                    name_el = _EINFORMA_NAME(row)
                     if not name_el:
                         continue
-                    name = (await name_el.inner_text()).strip()
+                    name = name_el[0].text_content().strip()
                     if not name:
                         continue
-                    c = {"legal_name": name.upper(), "source_portal": "einforma",
-                         "region": region.title(), "province": region.title(), "city": region.title()}
-                    href = await name_el.get_attribute("href")
+                    c = {"legal_name": name.upper(), **template}
+                    href = name_el[0].get("href")
                     if href:
                         c["source_url"] = href if href.startswith("http") else urljoin(BASE, href)
 
-                    cif_el = await row.query_selector(".cif, td:nth-child(2)")
+                    cif_el = _EINFORMA_CIF(row)
                     if cif_el:
-                        m = re.search(r"[A-Z]\d{7,8}", (await cif_el.inner_text()).strip())
+                        m = _CIF_RE.search(cif_el[0].text_content().strip())
                         if m:
                             c["cif"] = m.group(0)
 
                     # Website — look for external company links
                     excluded = ("einforma", "axesor", "google", "facebook", "twitter", "linkedin")
-                    web_els = await row.query_selector_all("a[href^='http']")
-                    for wel in web_els:
-                        href = await wel.get_attribute("href")
+                    for href in _EINFORMA_EXTERNAL_XP(row):
                         if href and not any(d in href.lower() for d in excluded):
                             c["website_url"] = href
                             c["domain"] = urlparse(href).netloc.replace("www.", "")
                             break
 
-                    companies.append(c)
+                    if not is_new_company(c, seen_companies):
+                        continue
+                    yield c
+                    total += 1
             elif links:
                 for link in links:
-                    if limit and len(companies) >= limit:
+                    if limit and total >= limit:
                         break
-                    name_part = re.search(r'/informes-empresa/([^/]+)', link)
+                    name_part = _EINFORMA_SLUG_RE.search(link)
                     if name_part:
                         raw = name_part.group(1).replace("-", " ").strip()
                         if raw:
-                            companies.append({
-                                "legal_name": raw.upper(),
-                                "source_portal": "einforma",
-                                "source_url": urljoin(BASE, link),
-                                "region": region.title(), "province": region.title(),
-                                "city": region.title(),
-                            })
+                            c = {"legal_name": raw.upper(), "source_url": urljoin(BASE, link), **template}
+                            if is_new_company(c, seen_companies):
+                                yield c
+                                total += 1
             else:
                 break
 
-            has_next = await page.query_selector("a[rel='next'], a:has-text('Siguiente')")
+            has_next = _EINFORMA_NEXT_XP(doc)
             if not has_next:
                 break
             pnum += 1
     finally:
-        await context.close()
-        await pw.stop()
-
-    return companies
+        await pool.close("einforma")
 
 
 # ---------------------------------------------------------------------------
@@ -634,24 +1134,63 @@ EMPRESIA_SEARCH_TERMS = [
     "GESTION", "COMERCIAL", "SOLUCIONES", "GRUPO",
 ]
 
-async def scrape_empresia(region, city, limit, headless=False, **kwargs):
-    pw, context, page = await launch_browser("empresia", headless)
-    companies = []
+# All body-text fields in one alternation so the page text is scanned once.
+# Each branch's last group names the field; line ends are lookaheads so a
+# match never swallows the start of the next field.
+_EMPRESIA_FIELDS_RE = re.compile(
+    r"Datos de (?P<name>.+?)(?=\n|$)"
+    r"|CIF\s*\n\s*(?P<cif>[A-Z]\d{7,8})"
+    r"|CNAE\s+(?P<cnae>\d{3,4})\s*[-–]\s*(?P<industry>.+?)(?=\n|$)"
+    r"|(?P<phone>\d{9})\s+\d{9}"
+    r"|[Nn]úmero empleados\s*\n?\s*(?P<employees>\d[\d.]*)"
+    r"|(?i:(?P<address>(?:CALLE|PASEO|AVENIDA|PLAZA|C/|CL |PG )[^\n]+?\([A-Z]+\)))"
+    r"|Objeto social\s*\n\s*(?P<summary>(?s:.+?))(?=\nCNAE|\nCIF|\nFecha)"
+)
+_EMPRESIA_FIELD_COUNT = 7
+_EMPRESIA_ADDRESS_CITY_RE = re.compile(r"\(([^)]+)\)\s*$")
+# Company datasheet blocks, most specific first; the whole body is the fallback.
+# The selectors aren't pinned to a known layout, so a block only counts when it
+# holds every label _EMPRESIA_FIELDS_RE keys on
+_EMPRESIA_CONTAINERS = ["div.ficha-empresa", "#datos-empresa", "div.ficha", "main"]
+_EMPRESIA_LABELS = ["Datos de", "CIF", "CNAE", "Objeto social"]
+# innerText of the first container holding all the labels, so menus, ads and
+# the footer are neither rendered to text nor scanned by the regex
+EMPRESIA_TEXT_JS = """([selectors, labels]) => {
+    for (const sel of selectors) {
+        const el = document.querySelector(sel);
+        if (!el) continue;
+        const text = el.innerText;
+        if (labels.every((l) => text.includes(l))) return text;
+    }
+    return document.body.innerText;
+}"""
+
+async def scrape_empresia(region, city, limit, pool, seen_companies=None, **kwargs):
+    seen_companies = set() if seen_companies is None else seen_companies
+    # The autocomplete dropdown needs its stylesheet to lay out clickable items
+    await pool.block_resources("empresia", keep={"stylesheet"})
+    page = await pool.first_page("empresia")
+    total = 0
     seen = set()
     BASE = "https://www.empresia.es"
+    host = urlparse(BASE).netloc
+    limiter = HostLimiter()
     location = (city or region).upper()
+    region_title = sys.intern(region.title())
+    template = {"source_portal": "empresia", "region": region_title, "province": region_title, "city": region_title}
 
     try:
+        await limiter.acquire(host)
         await page.goto(BASE, wait_until="domcontentloaded", timeout=20000)
         await human_delay(2, 4)
 
         for term in EMPRESIA_SEARCH_TERMS:
-            if limit and len(companies) >= limit:
+            if limit and total >= limit:
                 break
 
             query = f"{term} {location}"
             logger.info(f"Empresia: searching '{query}'")
-            await human_delay()
+            await limiter.acquire(host)
 
             await page.goto(BASE, wait_until="domcontentloaded", timeout=20000)
             await human_delay(1, 2)
@@ -678,10 +1217,10 @@ async def scrape_empresia(region, city, limit, headless=False, **kwargs):
             logger.info(f"  Got {len(texts)} suggestions")
 
             for text in texts:
-                if limit and len(companies) >= limit:
+                if limit and total >= limit:
                     break
 
-                await human_delay()
+                await limiter.acquire(host)
                 await page.goto(BASE, wait_until="domcontentloaded", timeout=20000)
                 await human_delay(1, 2)
 
@@ -707,9 +1246,15 @@ async def scrape_empresia(region, city, limit, headless=False, **kwargs):
                     continue
                 seen.add(slug)
 
-                body = await page.inner_text("body")
-                name_m = re.search(r"Datos de (.+?)(?:\n|$)", body)
-                name = name_m.group(1).strip() if name_m else None
+                body = await page.evaluate(EMPRESIA_TEXT_JS, [_EMPRESIA_CONTAINERS, _EMPRESIA_LABELS])
+                found = {}
+                for m in _EMPRESIA_FIELDS_RE.finditer(body):
+                    found.setdefault(m.lastgroup, m)
+                    if len(found) == _EMPRESIA_FIELD_COUNT:
+                        break
+
+                name_m = found.get("name")
+                name = name_m.group("name").strip() if name_m else None
                 if not name:
                     h1 = await page.query_selector("h1")
                     if h1:
@@ -719,38 +1264,37 @@ async def scrape_empresia(region, city, limit, headless=False, **kwargs):
 
                 c = {
                     "legal_name": name.upper(),
-                    "source_portal": "empresia",
                     "source_url": page.url,
-                    "region": region.title(), "province": region.title(), "city": region.title(),
+                    **template,
                 }
 
-                cif_m = re.search(r"CIF\s*\n\s*([A-Z]\d{7,8})", body)
+                cif_m = found.get("cif")
                 if cif_m:
-                    c["cif"] = cif_m.group(1)
+                    c["cif"] = cif_m.group("cif")
 
-                cnae_m = re.search(r"CNAE\s+(\d{3,4})\s*[-–]\s*(.+?)(?:\n|$)", body)
+                cnae_m = found.get("industry")
                 if cnae_m:
-                    c["cnae_code"] = cnae_m.group(1)
-                    c["industry"] = cnae_m.group(2).strip()[:256]
+                    c["cnae_code"] = cnae_m.group("cnae")
+                    c["industry"] = cnae_m.group("industry").strip()[:256]
 
-                phone_m = re.search(r"(\d{9})\s+\d{9}", body)
+                phone_m = found.get("phone")
                 if phone_m:
-                    c["phone"] = phone_m.group(1)
+                    c["phone"] = phone_m.group("phone")
 
-                emp_m = re.search(r"[Nn]úmero empleados\s*\n?\s*(\d[\d.]*)", body)
+                emp_m = found.get("employees")
                 if emp_m:
-                    c["employee_count"] = emp_m.group(1).replace(".", "")
+                    c["employee_count"] = emp_m.group("employees").replace(".", "")
 
-                addr_m = re.search(r"((?:CALLE|PASEO|AVENIDA|PLAZA|C/|CL |PG )[^\n]+?\([A-Z]+\))", body, re.I)
+                addr_m = found.get("address")
                 if addr_m:
-                    c["address"] = addr_m.group(1).strip()
-                    city_m = re.search(r"\(([^)]+)\)\s*$", addr_m.group(1))
+                    c["address"] = addr_m.group("address").strip()
+                    city_m = _EMPRESIA_ADDRESS_CITY_RE.search(addr_m.group("address"))
                     if city_m:
                         c["city"] = city_m.group(1).strip().title()
 
-                obj_m = re.search(r"Objeto social\s*\n\s*(.+?)(?:\nCNAE|\nCIF|\nFecha)", body, re.S)
+                obj_m = found.get("summary")
                 if obj_m:
-                    c["summary"] = obj_m.group(1).strip()[:500]
+                    c["summary"] = obj_m.group("summary").strip()[:500]
 
                 # Website — skip Axesor and partner links
                 excluded = ("empresia", "axesor", "einforma", "infocif", "google", "facebook")
@@ -764,13 +1308,13 @@ async def scrape_empresia(region, city, limit, headless=False, **kwargs):
                             c["domain"] = urlparse(href).netloc.replace("www.", "")
                             break
 
-                companies.append(c)
+                if not is_new_company(c, seen_companies):
+                    continue
+                yield c
+                total += 1
                 logger.info(f"  Saved: {c['legal_name']} (CIF: {c.get('cif', 'N/A')})")
     finally:
-        await context.close()
-        await pw.stop()
-
-    return companies
+        await pool.close("empresia")
 
 
 # ---------------------------------------------------------------------------
@@ -782,116 +1326,241 @@ LIBREBOR_PROVINCES = {
     "SEVILLA": "sevilla", "MALAGA": "malaga", "ALICANTE": "alicante",
     "ZARAGOZA": "zaragoza", "BILBAO": "bizkaia", "MURCIA": "murcia",
 }
+LIBREBOR_PROVINCES = {k.casefold(): v for k, v in LIBREBOR_PROVINCES.items()}
+
+LIBREBOR_CONCURRENCY = 5  # Company pages visited at once by the HTML fallback
+LIBREBOR_API_BATCH = 5  # API pages requested together
+# The only item keys read; servers that ignore the projection just send everything
+LIBREBOR_API_FIELDS = "name,url,cif,cnae"
+
+_LIBREBOR_LINK_SELECTOR = "a[href^='/borme/empresa/']"
+# Name, CIF, CNAE and external links of a company page in one round trip
+LIBREBOR_EXTRACT_JS = """() => {
+    const h1 = document.querySelector("h1");
+    const text = document.body.innerText;
+    const cif = text.match(/CIF:\\s*([A-Z]\\d{7,8})/);
+    const cnae = text.match(/CNAE:\\s*(\\d{3,4})/);
+    return {
+        name: h1 ? h1.innerText.trim() : null,
+        cif: cif ? cif[1] : null,
+        cnae: cnae ? cnae[1] : null,
+        hrefs: [...document.querySelectorAll("a[href^='http']")].map((a) => a.getAttribute("href")),
+    };
+}"""
+
+
+async def _librebor_api_get(context, url):
+    try:
+        return await context.request.get(url, timeout=30000)
+    except Exception as e:
+        logger.warning(f"LibreBOR: API request failed: {e}")
+        return None
 
-async def scrape_librebor(region, city, limit, headless=False, **kwargs):
-    pw, context, page = await launch_browser("librebor", headless)
-    companies = []
+
+async def _read_json(resp):
+    # Decided by the Content-Type header: HTML means a challenge or error page
+    if resp is None or "json" not in resp.headers.get("content-type", ""):
+        return None
+    try:
+        return orjson.loads(await resp.body())
+    except orjson.JSONDecodeError:
+        return None
+
+
+async def _scrape_librebor_company(page, limiter, base, link, template):
+    await limiter.acquire(urlparse(base).netloc)
+    try:
+        await page.goto(f"{base}{link}", wait_until="domcontentloaded", timeout=20000)
+    except Exception:
+        return None
+    if not await wait_for_challenge(page, timeout=60):
+        return None
+    try:
+        data = await page.evaluate(LIBREBOR_EXTRACT_JS)
+    except Exception:
+        return None
+    name = data["name"]
+    if not name:
+        return None
+    c = {"legal_name": name.upper(), "source_url": f"{base}{link}", **template}
+    if data["cif"]:
+        c["cif"] = data["cif"]
+    if data["cnae"]:
+        c["cnae_code"] = data["cnae"]
+
+    # Website — look for external company links
+    excluded = ("librebor", "libreborme", "google", "facebook", "twitter", "linkedin")
+    for href in data["hrefs"]:
+        if href and not any(d in href.lower() for d in excluded):
+            c["website_url"] = href
+            c["domain"] = urlparse(href).netloc.replace("www.", "")
+            break
+
+    return c
+
+
+async def scrape_librebor(region, city, limit, pool, seen_companies=None, **kwargs):
+    seen_companies = set() if seen_companies is None else seen_companies
+    context = await pool.get("librebor")
+    await pool.block_resources("librebor")
+    page = await pool.first_page("librebor")
+    total = 0
     BASE = "https://librebor.me"
-    province = LIBREBOR_PROVINCES.get(region.upper(), region.lower())
+    host = urlparse(BASE).netloc
+    # Fallback navigations and company tabs share one per-host schedule
+    limiter = HostLimiter()
+    # API pages go as fast as the server allows and only back off when throttled
+    rc = RateController()
+    province = LIBREBOR_PROVINCES.get(region.casefold(), region.lower())
+    region_title = sys.intern(region.title())
+    template = {"source_portal": "librebor", "city": region_title, "province": region_title, "region": region_title}
+
+    # Fallback company pages are visited on pooled tabs, a few at a time
+    sem = asyncio.Semaphore(LIBREBOR_CONCURRENCY)
+
+    async def visit(link):
+        async with sem:
+            detail_page = await pool.acquire_page("librebor")
+            try:
+                return await _scrape_librebor_company(detail_page, limiter, BASE, link, template)
+            finally:
+                pool.release_page("librebor", detail_page)
 
     try:
         logger.info("LibreBOR: navigating to homepage...")
+        await limiter.acquire(host)
         await page.goto(BASE, wait_until="domcontentloaded", timeout=30000)
         await human_delay(3, 5)
         if not await wait_for_challenge(page):
-            return companies
+            return
 
         logger.info("LibreBOR: access granted!")
 
+        api_base = f"{BASE}/borme/api/v1/empresa/provincia/{province}/?fields={LIBREBOR_API_FIELDS}&page="
         pnum = 1
-        while True:
-            if limit and len(companies) >= limit:
-                break
-
-            await human_delay()
-            api_url = f"{BASE}/borme/api/v1/empresa/provincia/{province}/?page={pnum}"
-            logger.info(f"LibreBOR: API page {pnum}")
-
-            try:
-                await page.goto(api_url, wait_until="domcontentloaded", timeout=30000)
-            except Exception:
-                break
-
-            if not await wait_for_challenge(page, timeout=120):
+        per_page = None  # Items per API page, learnt from the first JSON page
+        prefetched = {}  # Responses fetched ahead of a throttled page, still to handle
+        done = False
+        while not done:
+            if limit and total >= limit:
                 break
 
-            try:
-                body = await page.inner_text("body")
-                data = json.loads(body)
-            except (json.JSONDecodeError, Exception):
-                # HTML fallback
-                content = await page.content()
-                links = re.findall(r'href="(/borme/empresa/[^"]+)"', content)
-                if not links:
+            # Page 1 goes alone as a probe; later batches only cover what the
+            # limit still needs, up to LIBREBOR_API_BATCH pages
+            if per_page is None:
+                batch = 1
+            elif limit:
+                batch = min(LIBREBOR_API_BATCH, -(-(limit - total) // per_page))
+            else:
+                batch = LIBREBOR_API_BATCH
+
+            await rc.wait()
+            # Fetched through the context's request API: same cookies as the
+            # browser, but the JSON never gets rendered into a page. A batch of
+            # pages is requested at once and handled in page order.
+            pages = range(pnum, pnum + batch)
+            missing = [p for p in pages if p not in prefetched]
+            if missing:
+                logger.info(f"LibreBOR: API pages {', '.join(map(str, missing))}")
+                resps = await asyncio.gather(*[_librebor_api_get(context, f"{api_base}{p}") for p in missing])
+                prefetched.update(zip(missing, resps))
+
+            # Breaking out leaves pnum on the page to resume from
+            for pnum in pages:
+                resp = prefetched.pop(pnum)
+                # What is left of the limit, counted down as companies come in
+                remaining = limit - total if limit else None
+                if remaining is not None and remaining <= 0:
+                    done = True
                     break
-                for link in links:
-                    if limit and len(companies) >= limit:
+                if resp is not None and resp.status in (429, 503):
+                    if rc.delay >= rc.max_delay:
+                        logger.error(f"LibreBOR: still throttled after {rc.delay:.0f}s backoff")
+                        done = True
                         break
-                    await human_delay()
+                    rc.on_throttle()
+                    logger.warning(f"LibreBOR: throttled ({resp.status}), retrying in {rc.delay:.0f}s")
+                    break
+
+                data = await _read_json(resp)
+                if data is not None:
+                    rc.on_success()
+                else:
+                    # HTML fallback: load it in the tab, where a challenge can be solved
+                    await limiter.acquire(host)
                     try:
-                        await page.goto(f"{BASE}{link}", wait_until="domcontentloaded", timeout=20000)
+                        nav = await page.goto(f"{api_base}{pnum}", wait_until="domcontentloaded", timeout=30000)
                     except Exception:
-                        continue
-                    if not await wait_for_challenge(page, timeout=60):
-                        continue
-                    text = await page.inner_text("body")
-                    h1 = await page.query_selector("h1")
-                    if not h1:
-                        continue
-                    name = (await h1.inner_text()).strip()
+                        done = True
+                        break
+                    # A JSON answer means we are already admitted: no challenge DOM to wait for
+                    data = await _read_json(nav)
+                    if data is None:
+                        # Only a challenge counts as pushback; a plain HTML listing doesn't
+                        challenged = nav is not None and has_challenge(await nav.text())
+                        if challenged:
+                            rc.on_throttle()
+                        if not await wait_for_challenge(page, timeout=120):
+                            done = True
+                            break
+                        if challenged:
+                            # A solved challenge leaves the JSON in the tab and its clearance
+                            # cookies in the context, so ask the API again before falling
+                            # back to scraping links off an HTML listing
+                            data = await _read_json(await _librebor_api_get(context, f"{api_base}{pnum}"))
+
+                if data is None:
+                    # Only the hrefs cross CDP, not the serialised page. Listings link
+                    # each company more than once; keep the first, in order
+                    hrefs = await page.eval_on_selector_all(
+                        _LIBREBOR_LINK_SELECTOR, "els => els.map((e) => e.getAttribute('href'))"
+                    )
+                    links = list(dict.fromkeys(hrefs))
+                    if not links:
+                        done = True
+                        break
+                    for c in await asyncio.gather(*[visit(link) for link in links[:remaining]],
+                                                  return_exceptions=True):
+                        if c and not isinstance(c, Exception) and is_new_company(c, seen_companies):
+                            yield c
+                            total += 1
+                    continue
+
+                results = data.get("results", [])
+                if not results:
+                    done = True
+                    break
+                per_page = per_page or len(results)
+                for item in results:
+                    name = item.get("name", "").strip()
                     if not name:
                         continue
-                    c = {"legal_name": name.upper(), "source_portal": "librebor",
-                         "source_url": f"{BASE}{link}", "city": region.title(),
-                         "province": region.title(), "region": region.title()}
-                    cif_m = re.search(r"CIF:\s*([A-Z]\d{7,8})", text)
-                    if cif_m:
-                        c["cif"] = cif_m.group(1)
-                    cnae_m = re.search(r"CNAE:\s*(\d{3,4})", text)
-                    if cnae_m:
-                        c["cnae_code"] = cnae_m.group(1)
-
-                    # Website — look for external company links
-                    excluded = ("librebor", "libreborme", "google", "facebook", "twitter", "linkedin")
-                    web_els = await page.query_selector_all("a[href^='http']")
-                    for wel in web_els:
-                        href = await wel.get_attribute("href")
-                        if href and not any(d in href.lower() for d in excluded):
-                            c["website_url"] = href
-                            c["domain"] = urlparse(href).netloc.replace("www.", "")
+                    c = {"legal_name": name.upper(), **template}
+                    if item.get("url"):
+                        c["source_url"] = item["url"]
+                    if item.get("cif"):
+                        c["cif"] = item["cif"]
+                    cnae = item.get("cnae")
+                    if cnae:
+                        cnae = str(cnae)
+                        if len(cnae) <= 20:
+                            c["cnae_code"] = cnae
+                    if not is_new_company(c, seen_companies):
+                        continue
+                    yield c
+                    total += 1
+                    if remaining is not None:
+                        remaining -= 1
+                        if not remaining:
                             break
 
-                    companies.append(c)
-                pnum += 1
-                continue
-
-            results = data.get("results", [])
-            if not results:
-                break
-            for item in results:
-                if limit and len(companies) >= limit:
+                if not data.get("next"):
+                    done = True
                     break
-                name = item.get("name", "").strip()
-                if not name:
-                    continue
-                c = {"legal_name": name.upper(), "source_portal": "librebor",
-                     "city": region.title(), "province": region.title(), "region": region.title()}
-                if item.get("url"):
-                    c["source_url"] = item["url"]
-                if item.get("cif"):
-                    c["cif"] = item["cif"]
-                if item.get("cnae") and len(str(item["cnae"])) <= 20:
-                    c["cnae_code"] = str(item["cnae"])
-                companies.append(c)
-
-            if not data.get("next"):
-                break
-            pnum += 1
+            else:
+                pnum += 1
     finally:
-        await context.close()
-        await pw.stop()
-
-    return companies
+        await pool.close("librebor")
 
 
 # ---------------------------------------------------------------------------
@@ -908,48 +1577,93 @@ SCRAPERS = {
 }
 
 
+async def run(portals, out, headless=False, **kwargs):
+    total = 0
+    # Shared by the scrapers, so a company listed twice (within a portal or across
+    # portals) is written once and doesn't count towards a portal's limit
+    seen_companies = set()
+    # Output as JSON lines, batched so each write() hands over up to 1 MiB, but
+    # never held back longer than OUTPUT_FLUSH_INTERVAL: partial results reach
+    # the file (and downstream readers) while the run goes on
+    buf = bytearray()
+    loop = asyncio.get_running_loop()
+    timer = None
+
+    def flush():
+        nonlocal timer
+        if timer is not None:
+            timer.cancel()
+            timer = None
+        out.write(buf)
+        out.flush()
+        buf.clear()
+
+    try:
+        async with BrowserPool(headless=headless) as pool:
+            if len(portals) > 1:
+                # Boot the Playwright driver while the first portal is scraping
+                asyncio.ensure_future(pool.start())
+            for portal in portals:
+                async for company in SCRAPERS[portal](pool=pool, seen_companies=seen_companies, **kwargs):
+                    # Remove empty values
+                    company = {k: v for k, v in company.items() if v}
+                    buf += orjson.dumps(company)
+                    buf += b"\n"
+                    total += 1
+                    if len(buf) >= OUTPUT_BUFFER_SIZE:
+                        flush()
+                    elif timer is None:
+                        timer = loop.call_later(OUTPUT_FLUSH_INTERVAL, flush)
+    finally:
+        flush()
+    return total
+
+
 def main():
     parser = argparse.ArgumentParser(description="Standalone multi-portal scraper")
-    parser.add_argument("--portal", required=True, choices=SCRAPERS.keys())
+    parser.add_argument("--portal", required=True, choices=[*SCRAPERS, "all"])
     parser.add_argument("--region", default="BARCELONA", help="Province (e.g. BARCELONA, MADRID)")
     parser.add_argument("--city", default=None, help="Specific city slug")
-    parser.add_argument("--limit", type=int, default=None, help="Max companies to scrape")
+    parser.add_argument("--limit", type=int, default=None, help="Max companies to scrape (per portal)")
     parser.add_argument("--output", "-o", default=None, help="Output file (default: stdout)")
     parser.add_argument("--headless", action="store_true", help="Run browser headless (may get blocked)")
     parser.add_argument("--no-details", action="store_true", help="Skip detail pages for empresite (faster but no website/CNAE/phone)")
     parser.add_argument("--employee-min", type=int, default=10)
     parser.add_argument("--employee-max", type=int, default=200)
-    parser.add_argument("--delay-min", type=float, default=4.0, help="Min delay between requests (seconds)")
-    parser.add_argument("--delay-max", type=float, default=7.0, help="Max delay between requests (seconds)")
+    parser.add_argument("--delay-min", type=float, default=4.0, help="Min delay between requests to the same host (seconds)")
+    parser.add_argument("--delay-max", type=float, default=7.0, help="Max delay between requests to the same host (seconds)")
     args = parser.parse_args()
 
     global MIN_DELAY, MAX_DELAY
     MIN_DELAY = args.delay_min
     MAX_DELAY = args.delay_max
 
-    scraper = SCRAPERS[args.portal]
-    companies = asyncio.run(scraper(
-        region=args.region.upper(),
-        city=args.city.upper() if args.city else None,
-        limit=args.limit,
-        headless=args.headless,
-        details=not args.no_details,
-        employee_min=args.employee_min,
-        employee_max=args.employee_max,
-    ))
-
-    # Output as JSON lines
-    out = open(args.output, "w") if args.output else sys.stdout
+    # libuv's loop is a drop-in replacement with cheaper task and timer scheduling
+    try:
+        import uvloop
+        run_loop = uvloop.run
+    except ImportError:
+        run_loop = asyncio.run
+
+    portals = list(SCRAPERS) if args.portal == "all" else [args.portal]
+    # run() writes in batches and flushes after each one
+    out = open(args.output or sys.stdout.fileno(), "wb", closefd=bool(args.output))
     try:
-        for company in companies:
-            # Remove empty values
-            company = {k: v for k, v in company.items() if v}
-            out.write(json.dumps(company, ensure_ascii=False) + "\n")
+        total = run_loop(run(
+            portals,
+            out,
+            region=args.region.upper(),
+            city=args.city.upper() if args.city else None,
+            limit=args.limit,
+            headless=args.headless,
+            details=not args.no_details,
+            employee_min=args.employee_min,
+            employee_max=args.employee_max,
+        ))
     finally:
-        if args.output:
-            out.close()
+        out.close()
 
-    logger.info(f"Done: {len(companies)} companies scraped from {args.portal}")
+    logger.info(f"Done: {total} companies scraped from {args.portal}")
 
 
 if __name__ == "__main__":